@@ -10,7 +10,7 @@ import dask.config
 from awkward.typetracer import touch_data
 from dask.blockwise import fuse_roots, optimize_blockwise
 from dask.core import flatten
-from dask.highlevelgraph import HighLevelGraph
+from dask.highlevelgraph import HighLevelGraph, Layer
 from dask.local import get_sync
 
 from dask_awkward.layers import AwkwardBlockwiseLayer, AwkwardInputLayer
@@ -32,6 +32,9 @@ https://dask-awkward.readthedocs.io/en/stable/more/faq.html
 
 """
 
+_BLOCKWISE_TOKEN_PREFIX = "__dask_blockwise__"
+_BLOCKWISE_TOKEN_PREFIX_LEN = len(_BLOCKWISE_TOKEN_PREFIX)
+
 
 def all_optimizations(dsk: Mapping, keys: Sequence[Key], **_: Any) -> Mapping:
     """Run all optimizations that benefit dask-awkward computations.
@@ -65,8 +68,14 @@ def optimize(dsk: HighLevelGraph, keys: Sequence[Key], **_: Any) -> Mapping:
     input layers.
 
     """
-    if dask.config.get("awkward.optimization.enabled"):
-        which = dask.config.get("awkward.optimization.which")
+    # both optimizations act only on awkward blockwise (and input) layers
+    if not any(isinstance(v, AwkwardBlockwiseLayer) for v in dsk.layers.values()):
+        return dsk
+
+    # a single lookup of the section; the config may change between calls
+    opt_config = dask.config.get("awkward.optimization")
+    if opt_config["enabled"]:
+        which = opt_config["which"]
         if "columns" in which:
             dsk = optimize_columns(dsk, keys)
         if "layer-chains" in which:
@@ -81,51 +90,71 @@ def _prepare_buffer_projection(
     """Pair layer names with lists of necessary columns."""
     import awkward as ak
 
-    if not _has_projectable_awkward_io_layer(dsk):
+    projectable, outputs, any_projectable = _classify_layers(dsk)
+    if not any_projectable:
         return None
 
+    minimal_keys: set[Key] = set()
+    for k in keys:
+        if isinstance(k, tuple) and len(k) == 2:
+            minimal_keys.add((k[0], 0))
+        else:
+            minimal_keys.add(k)
+
+    # only layers that the keys depend on are mocked and run
+    reachable = _reachable_layer_names(dsk, minimal_keys)
+
     layer_to_projection_state: dict[str, Any] = {}
     layer_to_reports: dict[str, TypeTracerReport] = {}
-    projection_layers = dict(dsk.layers)
+    projection_layers: dict[str, Layer] = {}
+    # layers that were replaced (mocked); their cached dicts are stale
+    mutated: set[str] = set()
 
+    new_layer: Layer
     for name, lay in dsk.layers.items():
-        if isinstance(lay, AwkwardInputLayer):
-            if lay.is_projectable:
-                # Insert mocked array into layers, replacing generation func
-                # Keep track of mocked state
-                (
-                    projection_layers[name],
-                    layer_to_reports[name],
-                    layer_to_projection_state[name],
-                ) = lay.prepare_for_projection()
-            elif lay.is_mockable:
-                projection_layers[name] = lay.mock()
+        if name in projectable:
+            # Insert mocked array into layers, replacing generation func
+            # Keep track of mocked state
+            (
+                new_layer,
+                layer_to_reports[name],
+                layer_to_projection_state[name],
+            ) = cast(AwkwardInputLayer, lay).prepare_for_projection()
+        elif name not in reachable:
+            continue
+        elif isinstance(lay, AwkwardInputLayer):
+            new_layer = lay.mock() if lay.is_mockable else lay
         elif hasattr(lay, "mock"):
-            projection_layers[name] = lay.mock()
-
-    for name in _ak_output_layer_names(dsk):
-        projection_layers[name] = _mock_output(projection_layers[name])
+            new_layer = lay.mock()
+        else:
+            new_layer = lay
 
-    hlg = HighLevelGraph(projection_layers, dsk.dependencies)
+        if name in reachable:
+            if name in outputs:
+                new_layer = _mock_output(new_layer)
+            projection_layers[name] = new_layer
+            if new_layer is not lay:
+                mutated.add(name)
 
-    minimal_keys: set[Key] = set()
-    for k in keys:
-        if isinstance(k, tuple) and len(k) == 2:
-            minimal_keys.add((k[0], 0))
-        else:
-            minimal_keys.add(k)
+    hlg = HighLevelGraph(
+        projection_layers, {n: dsk.dependencies[n] for n in projection_layers}
+    )
 
     # now we try to compute for each possible output layer key (leaf
     # node on partition 0); this will cause the typetacer reports to
     # get correct fields/columns touched. If the result is a record or
     # an array we of course want to touch all of the data/fields.
     try:
-        for layer in hlg.layers.values():
-            layer.__dict__.pop("_cached_dict", None)
+        for name in mutated:
+            hlg.layers[name].__dict__.pop("_cached_dict", None)
         results = get_sync(hlg, list(minimal_keys))
+        # the touched copies are not needed, so skip wrapping them in
+        # high-level objects; identical results only need one walk.
+        touched: set[int] = set()
         for out in results:
-            if isinstance(out, (ak.Array, ak.Record)):
-                touch_data(out)
+            if isinstance(out, (ak.Array, ak.Record)) and id(out) not in touched:
+                touched.add(id(out))
+                touch_data(out, highlevel=False)
     except Exception as err:
         on_fail = dask.config.get("awkward.optimization.on-fail")
         # this is the default, throw a warning but skip the optimization.
@@ -192,38 +221,73 @@ def optimize_columns(dsk: HighLevelGraph, keys: Sequence[Key]) -> HighLevelGraph
             report=layer_to_reports[name], state=state
         )
 
-    return HighLevelGraph(layers, dsk.dependencies)
+    # projected input layers have the same keys and dependencies as the
+    # originals, so any key dependencies already computed remain valid.
+    return HighLevelGraph(layers, dsk.dependencies, dsk.key_dependencies)
+
 
+def _classify_layers(dsk: HighLevelGraph) -> tuple[set[str], set[str], bool]:
+    """Classify the layers of a graph in a single pass.
 
-def _layers_with_annotation(dsk: HighLevelGraph, key: str) -> list[str]:
-    return [n for n, v in dsk.layers.items() if (v.annotations or {}).get(key)]
+    Parameters
+    ----------
+    dsk : HighLevelGraph
+        Graph of interest.
 
+    Returns
+    -------
+    set[str]
+        Names of the project-able ``AwkwardInputLayer`` layers.
+    set[str]
+        Names of the output layers (annotated with 'ak_output').
+    bool
+        True if the graph has at least one project-able input layer.
 
-def _ak_output_layer_names(dsk: HighLevelGraph) -> list[str]:
-    """Get a list output layer names.
+    """
+    projectable: set[str] = set()
+    outputs: set[str] = set()
+    for name, v in dsk.layers.items():
+        if isinstance(v, AwkwardInputLayer) and v.is_projectable:
+            projectable.add(name)
+        if v.annotations is not None and v.annotations.get("ak_output"):
+            outputs.add(name)
+    return projectable, outputs, bool(projectable)
 
-    Output layer names are annotated with 'ak_output'.
+
+def _reachable_layer_names(dsk: HighLevelGraph, keys: Iterable[Key]) -> set[str]:
+    """Get the names of the layers necessary to compute some keys.
+
+    If a key cannot be associated with a layer by its name, all
+    layers in the graph are considered necessary.
 
     Parameters
     ----------
     dsk : HighLevelGraph
         Graph of interest.
+    keys : Iterable[Key]
+        Keys that are requested from the graph.
 
     Returns
     -------
-    list[str]
-        Names of the output layers.
+    set[str]
+        Names of the layers the keys depend on (including their own).
 
     """
-    return _layers_with_annotation(dsk, "ak_output")
-
+    stack: list[str] = []
+    for k in keys:
+        name = k[0] if isinstance(k, tuple) else k
+        if not isinstance(name, str) or name not in dsk.layers:
+            return set(dsk.layers)
+        stack.append(name)
 
-def _has_projectable_awkward_io_layer(dsk: HighLevelGraph) -> bool:
-    """Check if a graph at least one AwkwardInputLayer that is project-able."""
-    for _, v in dsk.layers.items():
-        if isinstance(v, AwkwardInputLayer) and v.is_projectable:
-            return True
-    return False
+    dependencies = dsk.dependencies
+    reachable: set[str] = set()
+    while stack:
+        name = stack.pop()
+        if name not in reachable:
+            reachable.add(name)
+            stack.extend(dependencies[name])
+    return reachable
 
 
 def _touch_all_data(*args, **kwargs):
@@ -232,16 +296,19 @@ def _touch_all_data(*args, **kwargs):
         touch_data(arg)
 
 
+def _shallow_layer_with_dsk(layer, new_dsk):
+    """Shallow copy a layer, replacing only its ``dsk`` attribute."""
+    new_layer = copy.copy(layer)
+    new_layer.dsk = new_dsk
+    return new_layer
+
+
 def _mock_output(layer):
     """Update a layer to run the _touch_all_data."""
     assert len(layer.dsk) == 1
 
-    new_layer = copy.deepcopy(layer)
-    mp = new_layer.dsk.copy()
-    for k in iter(mp.keys()):
-        mp[k] = (_touch_all_data,) + mp[k][1:]
-    new_layer.dsk = mp
-    return new_layer
+    new_dsk = {k: (_touch_all_data,) + v[1:] for k, v in layer.dsk.items()}
+    return _shallow_layer_with_dsk(layer, new_dsk)
 
 
 def rewrite_layer_chains(dsk: HighLevelGraph, keys: Sequence[Key]) -> HighLevelGraph:
@@ -281,48 +348,60 @@ def rewrite_layer_chains(dsk: HighLevelGraph, keys: Sequence[Key]) -> HighLevelG
     required_layers = {k[0] for k in keys if isinstance(k, tuple)}
     layers = {}
     # find chains; each chain list is at least two keys long
+    dsk_layers = dsk.layers
+    dependencies = dsk.dependencies
     dependents = dsk.dependents
-    all_layers = set(dsk.layers)
+    # lengths of the blockwise layers, the only layers that can be chained
+    layer_lens = {
+        n: len(v) for n, v in dsk_layers.items() if isinstance(v, AwkwardBlockwiseLayer)
+    }
+    all_layers = set(dsk_layers)
     while all_layers:
         layer_key = all_layers.pop()
-        layer = dsk.layers[layer_key]
-        if not isinstance(layer, AwkwardBlockwiseLayer):
+        layer = dsk_layers[layer_key]
+        if layer_key not in layer_lens:
             # shortcut to avoid making comparisons
             layers[layer_key] = layer  # passthrough unchanged
             continue
         children = dependents[layer_key]
         chain = [layer_key]
         current_layer_key = layer_key
-        while (
-            len(children) == 1
-            and dsk.dependencies[first(children)] == {current_layer_key}
-            and isinstance(dsk.layers[first(children)], AwkwardBlockwiseLayer)
-            and len(dsk.layers[current_layer_key]) == len(dsk.layers[first(children)])
-            and current_layer_key not in required_layers
-        ):
+        while len(children) == 1 and current_layer_key not in required_layers:
+            child = first(children)
+            if not (
+                child in layer_lens
+                and dependencies[child] == {current_layer_key}
+                and layer_lens[current_layer_key] == layer_lens[child]
+            ):
+                break
             # walk forwards
-            current_layer_key = first(children)
+            current_layer_key = child
             chain.append(current_layer_key)
             all_layers.remove(current_layer_key)
             children = dependents[current_layer_key]
 
-        parents = dsk.dependencies[layer_key]
-        while (
-            len(parents) == 1
-            and dependents[first(parents)] == {layer_key}
-            and isinstance(dsk.layers[first(parents)], AwkwardBlockwiseLayer)
-            and len(dsk.layers[layer_key]) == len(dsk.layers[first(parents)])
-            and next(iter(parents)) not in required_layers
-        ):
+        parents = dependencies[layer_key]
+        back = []
+        while len(parents) == 1:
+            parent = first(parents)
+            if not (
+                parent in layer_lens
+                and dependents[parent] == {layer_key}
+                and layer_lens[layer_key] == layer_lens[parent]
+                and parent not in required_layers
+            ):
+                break
             # walk backwards
-            layer_key = first(parents)
-            chain.insert(0, layer_key)
+            layer_key = parent
+            back.append(layer_key)
             all_layers.remove(layer_key)
-            parents = dsk.dependencies[layer_key]
+            parents = dependencies[layer_key]
+        if back:
+            chain = back[::-1] + chain
         if len(chain) > 1:
             chains.append(chain)
             layers[chain[-1]] = copy.copy(
-                dsk.layers[chain[-1]]
+                dsk_layers[chain[-1]]
             )  # shallow copy to be mutated
         else:
             layers[layer_key] = layer  # passthrough unchanged
@@ -333,11 +412,12 @@ def rewrite_layer_chains(dsk: HighLevelGraph, keys: Sequence[Key]) -> HighLevelG
         # outputs are the outputs of chain[-1]
         # .dsk is composed from the .dsk of each layer
         outkey = chain[-1]
-        layer0 = dsk.layers[chain[0]]
+        layer0 = dsk_layers[chain[0]]
         outlayer = layers[outkey]
         numblocks = [nb[0] for nb in layer0.numblocks.values() if nb[0] is not None][0]  # type: ignore
         deps[outkey] = deps[chain[0]]  # type: ignore
-        [deps.pop(ch) for ch in chain[:-1]]  # type: ignore
+        for ch in chain[:-1]:
+            deps.pop(ch)  # type: ignore
 
         subgraph = layer0.dsk.copy()  # type: ignore
         indices = list(layer0.indices)  # type: ignore
@@ -345,7 +425,7 @@ def rewrite_layer_chains(dsk: HighLevelGraph, keys: Sequence[Key]) -> HighLevelG
 
         outlayer.io_deps = layer0.io_deps  # type: ignore
         for chain_member in chain[1:]:
-            layer = dsk.layers[chain_member]
+            layer = dsk_layers[chain_member]
             for k in layer.io_deps:  # type: ignore
                 outlayer.io_deps[k] = layer.io_deps[k]  # type: ignore
             func, *args = layer.dsk[chain_member]  # type: ignore
@@ -369,18 +449,19 @@ def rewrite_layer_chains(dsk: HighLevelGraph, keys: Sequence[Key]) -> HighLevelG
 def _recursive_replace(args, layer, parent, indices):
     args2 = []
     for arg in args:
-        if isinstance(arg, str) and arg.startswith("__dask_blockwise__"):
-            ind = int(arg[18:])
-            if layer.indices[ind][1] is None:
+        if isinstance(arg, str) and arg.startswith(_BLOCKWISE_TOKEN_PREFIX):
+            index = layer.indices[int(arg[_BLOCKWISE_TOKEN_PREFIX_LEN:])]
+            name, ind = index
+            if ind is None:
                 # this is a simple arg
-                args2.append(layer.indices[ind][0])
-            elif layer.indices[ind][0] == parent:
+                args2.append(name)
+            elif name == parent:
                 # arg refers to output of previous layer
                 args2.append(parent)
             else:
                 # arg refers to things defined in io_deps
-                indices.append(layer.indices[ind])
-                args2.append(f"__dask_blockwise__{len(indices) - 1}")
+                indices.append(index)
+                args2.append(f"{_BLOCKWISE_TOKEN_PREFIX}{len(indices) - 1}")
         elif isinstance(arg, list):
             args2.append(_recursive_replace(arg, layer, parent, indices))
         elif isinstance(arg, tuple):
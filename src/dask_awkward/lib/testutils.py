@@ -3,12 +3,13 @@ from __future__ import annotations
 import functools
 import random
 import time
+from collections.abc import Sequence
 from typing import Any
 
 import awkward as ak
 import numpy as np
 from awkward.typetracer import typetracer_from_form
-from dask.base import is_dask_collection
+from dask.base import compute, is_dask_collection
 from packaging.version import Version
 
 from dask_awkward.lib.core import Array, Record, typetracer_array
@@ -122,6 +123,20 @@ def assert_eq_other(
     assert ares == bres
 
 
+def assert_eq_batched(
+    a: Sequence[Any],
+    b: Sequence[Any],
+    scheduler: Any | None = None,
+    **kwargs: Any,
+) -> None:
+    # compute all of the collections in a with a single graph; the
+    # graph is optimized (and column projected) for their union
+    scheduler = scheduler or DEFAULT_SCHEDULER
+    assert len(a) == len(b)
+    for ares, bres in zip(compute(*a, scheduler=scheduler), b):
+        assert_eq(ares, bres, scheduler=scheduler, **kwargs)
+
+
 def make_xy_point() -> dict[str, int]:
     return {"x": _RG.randint(0, 10), "y": _RG.randint(0, 10)}
 
@@ -67,6 +67,7 @@ def daa(ndjson_points1: str) -> dak.Array:
 
 @pytest.fixture(scope="session")
 def pq_points_dir(daa: dak.Array, tmp_path_factory: pytest.TempPathFactory) -> str:
+    pytest.importorskip("pyarrow")
     pqdir = tmp_path_factory.mktemp("pqfiles")
     dak.to_parquet(daa, str(pqdir))
     return str(pqdir)
@@ -164,6 +165,16 @@ def L4() -> list[list[dict[str, float]] | None]:
     ]
 
 
+@pytest.fixture(scope="session")
+def caa_L4(L4: list[list[dict[str, float]] | None]) -> ak.Array:
+    return ak.Array(L4)
+
+
+@pytest.fixture(scope="session")
+def daa_L4(caa_L4: ak.Array) -> dak.Array:
+    return dak.from_awkward(caa_L4, 1)
+
+
 @pytest.fixture(scope="session")
 def caa_parquet(caa: ak.Array, tmp_path_factory: pytest.TempPathFactory) -> str:
     fname = tmp_path_factory.mktemp("parquet_data") / "caa.parquet"
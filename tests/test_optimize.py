@@ -153,3 +153,36 @@ def test_optimization_runs_on_multiple_collections_gh430(tmp_path_factory):
     assert str(x)
     assert str(y)
     assert str(z)
+
+
+def test_reachable_layer_names(daa):
+    from dask.highlevelgraph import HighLevelGraph
+    from dask.local import get_sync
+
+    from dask_awkward.lib.optimize import _reachable_layer_names, optimize_columns
+
+    x = daa.points.x + 1
+    y = daa.points.y * 2
+    hlg = HighLevelGraph.merge(x.dask, y.dask)
+
+    reachable = _reachable_layer_names(hlg, [(x.name, 0)])
+    assert reachable == set(x.dask.layers)
+    assert y.name not in reachable
+
+    # a key that is not named after a layer means everything is needed
+    assert _reachable_layer_names(hlg, ["not-a-layer"]) == set(hlg.layers)
+
+    # projecting the merged graph for only x's keys still works
+    keys = x.__dask_keys__()
+    projected = optimize_columns(hlg, keys)
+    parts = get_sync(projected, keys)
+    assert ak.concatenate(parts).tolist() == x.compute().tolist()
+
+
+def test_optimize_passthrough_without_awkward_layers():
+    from dask.highlevelgraph import HighLevelGraph
+
+    from dask_awkward.lib.optimize import optimize
+
+    hlg = HighLevelGraph.from_collections("a", {("a", 0): 1}, dependencies=())
+    assert optimize(hlg, [("a", 0)]) is hlg
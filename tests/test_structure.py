@@ -1,16 +1,50 @@
 from __future__ import annotations
 
+import re
 from typing import Any
 
 import awkward as ak
+import dask
 import numpy as np
 import pytest
 
 import dask_awkward as dak
-from dask_awkward.lib.testutils import AK_LTE_2_5_0, assert_eq
+from dask_awkward.lib.testutils import (
+    AK_LTE_2_5_0,
+    DEFAULT_SCHEDULER,
+    assert_eq,
+    assert_eq_batched,
+)
 from dask_awkward.utils import DaskAwkwardNotImplemented
 
 
+def _literal(message: str) -> re.Pattern:
+    return re.compile(re.escape(message))
+
+
+_MATCH_ONLY_MAPPINGS = _literal("only mappings or sequences are supported")
+_MATCH_WITH_FIELD_BASE = _literal(
+    "Base argument in with_field must be a dask_awkward.Array"
+)
+_MATCH_WITHOUT_FIELD_BASE = _literal(
+    "Base argument in without_field must be a dask_awkward.Array"
+)
+_MATCH_WITH_FIELD_VALUE = _literal(
+    "with_field cannot accept string, bytes, list, or dict values yet"
+)
+_MATCH_SETITEM_VALUE = _literal(
+    "Supplying anything other than a dak.Array, or Number to __setitem__ "
+    "is not yet available!\n\n"
+    "If you would like this unsupported call to be supported by\n"
+    "dask-awkward please open an issue at:\n"
+    "https://github.com/dask-contrib/dask-awkward."
+)
+_MATCH_FIELDS_LENGTH = _literal("if provided, the length")
+_MATCH_ARGCOMBINATIONS_AXIS = _literal(
+    "the 'axis' for argcombinations must be non-negative"
+)
+
+
 @pytest.mark.parametrize("axis", [None, 0, 1, -1])
 def test_flatten(caa: ak.Array, daa: dak.Array, axis: int | None) -> None:
     cr = ak.flatten(caa.points.x, axis=axis)
@@ -34,17 +68,6 @@ def test_num(caa: ak.Array, daa: dak.Array, axis: int) -> None:
     assert_eq(dak.num(da.x, axis=axis), ak.num(ca.x, axis=axis))
 
 
-def test_zip_dict_input(caa: ak.Array, daa: dak.Array) -> None:
-    da1 = daa["points"]["x"]
-    da2 = daa["points"]["x"]
-    ca1 = caa["points"]["x"]
-    ca2 = caa["points"]["x"]
-
-    da_z = dak.zip({"a": da1, "b": da2})
-    ca_z = ak.zip({"a": ca1, "b": ca2})
-    assert_eq(da_z, ca_z)
-
-
 def test_unzip_dict_input(caa: ak.Array, daa: dak.Array) -> None:
     assert_eq(dak.zip(dak.unzip(daa["points"])), ak.zip(ak.unzip(caa["points"])))
 
@@ -63,34 +86,25 @@ def test_unzip_not_record() -> None:
     assert_eq(dak.zip(dak.unzip(dakarray)), ak.zip(ak.unzip(array)))
 
 
-def test_zip_list_input(caa: ak.Array, daa: dak.Array) -> None:
-    da1 = daa.points.x
-    ca1 = caa.points.x
-    dz1 = dak.zip([da1, da1])
-    cz1 = ak.zip([ca1, ca1])
-    assert_eq(dz1, cz1)
-    dz2 = dak.zip([da1, da1, da1])
-    cz2 = ak.zip([ca1, ca1, ca1])
-    assert_eq(dz2, cz2)
-
+@pytest.mark.parametrize("container", [list, tuple, dict])
+def test_zip_input(caa: ak.Array, daa: dak.Array, container: type) -> None:
+    def pack(arrays):
+        if container is dict:
+            return dict(zip("abc", arrays))
+        return container(arrays)
 
-def test_zip_tuple_input(caa: ak.Array, daa: dak.Array) -> None:
     da1 = daa.points.x
     ca1 = caa.points.x
-    dz1 = dak.zip((da1, da1))
-    cz1 = ak.zip((ca1, ca1))
-    assert_eq(dz1, cz1)
-    dz2 = dak.zip((da1, da1, da1))
-    cz2 = ak.zip((ca1, ca1, ca1))
-    assert_eq(dz2, cz2)
+    assert_eq_batched(
+        [dak.zip(pack([da1] * n)) for n in (2, 3)],
+        [ak.zip(pack([ca1] * n)) for n in (2, 3)],
+    )
 
 
 def test_zip_bad_input(daa: dak.Array) -> None:
     da1 = daa.points.x
     gd = (x for x in (da1, da1))
-    with pytest.raises(
-        DaskAwkwardNotImplemented, match="only mappings or sequences are supported"
-    ):
+    with pytest.raises(DaskAwkwardNotImplemented, match=_MATCH_ONLY_MAPPINGS):
         dak.zip(gd)
 
 
@@ -136,24 +150,37 @@ def test_zeros_like(caa: ak.Array, daa: dak.Array) -> None:
     assert_eq(da1, ca1)
 
 
+_NONELIST_A: list[Any] = [[1, 2, None], [], [None], [5, 6, 7, None], [1, 2], None]
+_NONELIST_B: list[Any] = [[None, 2, 1], [None], [], None, [7, 6, None, 5], [None, None]]
+
+
+@pytest.fixture(scope="module")
+def _nonelist_ak() -> ak.Array:
+    return ak.from_iter(_NONELIST_A + _NONELIST_B)
+
+
+@pytest.fixture(scope="module")
+def _nonelist_dak() -> dak.Array:
+    return dak.from_lists([_NONELIST_A, _NONELIST_B])
+
+
 @pytest.mark.parametrize("vf", [9, 99.9])
 @pytest.mark.parametrize("axis", [None, 0, 1, -1])
-def test_fill_none(vf: int | float | str, axis: int | None) -> None:
-    a = [[1, 2, None], [], [None], [5, 6, 7, None], [1, 2], None]
-    b = [[None, 2, 1], [None], [], None, [7, 6, None, 5], [None, None]]
-    c = dak.from_lists([a, b])
-    d = dak.fill_none(c, vf, axis=axis)
-    e = ak.fill_none(ak.from_iter(a + b), vf, axis=axis)
+def test_fill_none(
+    _nonelist_ak: ak.Array,
+    _nonelist_dak: dak.Array,
+    vf: int | float | str,
+    axis: int | None,
+) -> None:
+    d = dak.fill_none(_nonelist_dak, vf, axis=axis)
+    e = ak.fill_none(_nonelist_ak, vf, axis=axis)
     assert_eq(d, e, check_forms=(not isinstance(vf, str)))
 
 
 @pytest.mark.parametrize("axis", [None, 0, 1, -1])
-def test_drop_none(axis: int) -> None:
-    a = [[1, 2, None], [], [None], [5, 6, 7, None], [1, 2], None]
-    b = [[None, 2, 1], [None], [], None, [7, 6, None, 5], [None, None]]
-    c = dak.from_lists([a, b])
-    d = dak.drop_none(c)
-    e = ak.drop_none(ak.from_iter(a + b))
+def test_drop_none(_nonelist_ak: ak.Array, _nonelist_dak: dak.Array, axis: int) -> None:
+    d = dak.drop_none(_nonelist_dak)
+    e = ak.drop_none(_nonelist_ak)
     assert_eq(d, e)
 
 
@@ -183,84 +210,98 @@ def test_local_index(daa, caa):
     )
 
 
-def test_mask(daa, caa):
-    mask = ak.any(caa.points.x > 3, axis=1)
-    dmask = dak.any(daa.points.x > 3, axis=1)
+@pytest.fixture(scope="module")
+def _points_x_gt3(caa, daa):
+    return ak.any(caa.points.x > 3, axis=1), dak.any(daa.points.x > 3, axis=1)
+
+
+def test_mask(daa, caa, _points_x_gt3):
+    mask, dmask = _points_x_gt3
 
     assert_eq(daa.mask[dmask], caa.mask[mask])
     assert_eq(dak.mask(daa, dmask), ak.mask(caa, mask))
 
 
-def test_mask_from_awkward(daa, caa):
-    mask = ak.any(caa.points.x > 3, axis=1)
+def test_mask_from_awkward(daa, caa, _points_x_gt3):
+    mask, _ = _points_x_gt3
     dmask = dak.from_awkward(mask, daa.npartitions)
 
     assert_eq(dak.mask(daa, dmask), ak.mask(caa, mask))
 
 
+_PADNONE_A: list[Any] = [[1, 2, 3], [4], None]
+_PADNONE_B: list[Any] = [[7], [], None, [6, 7, 8]]
+
+
+@pytest.fixture(scope="module")
+def _padnone_ak() -> ak.Array:
+    return ak.from_iter([_PADNONE_A, _PADNONE_B] + [_PADNONE_B, _PADNONE_A])
+
+
+@pytest.fixture(scope="module")
+def _padnone_dak() -> dak.Array:
+    return dak.from_lists([[_PADNONE_A, _PADNONE_B], [_PADNONE_B, _PADNONE_A]])
+
+
 @pytest.mark.parametrize("axis", [1, -1, 2, -2])
 @pytest.mark.parametrize("target", [5, 10, 1])
-def test_pad_none(axis: int, target: int) -> None:
-    a = [[1, 2, 3], [4], None]
-    b = [[7], [], None, [6, 7, 8]]
-    c = dak.from_lists([[a, b], [b, a]])
-    d = ak.from_iter([a, b] + [b, a])
+def test_pad_none(
+    _padnone_ak: ak.Array, _padnone_dak: dak.Array, axis: int, target: int
+) -> None:
     assert_eq(
-        dak.pad_none(c, target=target, axis=axis),
-        ak.pad_none(d, target=target, axis=axis),
+        dak.pad_none(_padnone_dak, target=target, axis=axis),
+        ak.pad_none(_padnone_ak, target=target, axis=axis),
     )
 
 
 def test_with_field(caa: ak.Array, daa: dak.Array) -> None:
-    new_caa = ak.with_field(caa["points"], caa["points"]["x"], where="xx")
-    new_daa = dak.with_field(daa["points"], daa["points"]["x"], where="xx")
-    assert_eq(new_caa, new_daa)
-    assert_eq(ak.without_field(new_caa, "xx"), ak.without_field(new_daa, "xx"))
-
-    new_caa = ak.with_field(caa["points"], 1, where="xx")
-    new_daa = dak.with_field(daa["points"], 1, where="xx")
-    assert_eq(new_caa, new_daa)
-    assert_eq(ak.without_field(new_caa, "xx"), ak.without_field(new_daa, "xx"))
-
-    new_caa = ak.with_field(caa["points"], 1.0, where="xx")
-    new_daa = dak.with_field(daa["points"], 1.0, where="xx")
-    assert_eq(new_caa, new_daa)
-    assert_eq(ak.without_field(new_caa, "xx"), ak.without_field(new_daa, "xx"))
-
-    with pytest.raises(
-        ValueError,
-        match="Base argument in with_field must be a dask_awkward.Array",
-    ):
+    dak_results = []
+    ak_results = []
+    for cvalue, dvalue in [
+        (caa["points"]["x"], daa["points"]["x"]),
+        (1, 1),
+        (1.0, 1.0),
+    ]:
+        new_caa = ak.with_field(caa["points"], cvalue, where="xx")
+        new_daa = dak.with_field(daa["points"], dvalue, where="xx")
+        dak_results.append(new_daa)
+        ak_results.append(new_caa)
+        # on its own graph, so new_daa cannot hide a column it fails to project
+        assert_eq(ak.without_field(new_daa, "xx"), ak.without_field(new_caa, "xx"))
+
+    assert_eq_batched(dak_results, ak_results)
+
+    with pytest.raises(ValueError, match=_MATCH_WITH_FIELD_BASE):
         _ = dak.with_field([{"foo": 1.0}, {"foo": 2.0}], daa.points.x, where="x")
 
-    with pytest.raises(
-        ValueError,
-        match="Base argument in without_field must be a dask_awkward.Array",
-    ):
+    with pytest.raises(ValueError, match=_MATCH_WITHOUT_FIELD_BASE):
         _ = dak.without_field(
             [{"foo": [1.0, 2.0], "bar": [3.0, 4.0]}],
             "bar",
         )
 
-    with pytest.raises(
-        ValueError,
-        match="with_field cannot accept string, bytes, list, or dict values yet",
-    ):
+    with pytest.raises(ValueError, match=_MATCH_WITH_FIELD_VALUE):
         _ = dak.with_field(daa["points"], "hi there", where="q")
 
 
+def _hypot(x, y):
+    return np.sqrt(x * x + y * y)
+
+
 def test_setitem(caa: ak.Array, daa: dak.Array) -> None:
+    # assign into copies; caa and daa are shared session fixtures
+    caa = ak.copy(caa)
+    daa = dak.copy(daa)
+
     daa["xx"] = daa["points"]["x"]
     caa["xx"] = caa["points"]["x"]
 
-    daa["points", "z"] = np.sqrt(daa.points.x**2 + daa.points.y**2)
+    # a single layer for the whole expression
+    daa["points", "z"] = dak.map_partitions(_hypot, daa.points.x, daa.points.y)
     caa["points", "z"] = np.sqrt(caa.points.x**2 + caa.points.y**2)
     assert_eq(caa, daa)
 
-    with pytest.raises(
-        DaskAwkwardNotImplemented,
-        match="Supplying anything other than a dak.Array, or Number to __setitem__ is not yet available!\n\nIf you would like this unsupported call to be supported by\ndask-awkward please open an issue at:\nhttps://github.com/dask-contrib/dask-awkward.",
-    ):
+    with pytest.raises(DaskAwkwardNotImplemented, match=_MATCH_SETITEM_VALUE):
         daa["points", "q"] = "hi there"
 
 
@@ -271,86 +312,68 @@ def test_with_parameter() -> None:
     d = dak.with_parameter(c, "something", {})
     x = ak.from_iter(a + b)
     y = ak.with_parameter(x, "something", {})
-    assert_eq(d, y)
+    d2 = dak.without_parameters(d)
+    y2 = ak.without_parameters(y)
+    computed_d, computed_d2 = dask.compute(d, d2, scheduler=DEFAULT_SCHEDULER)
 
-    assert d.compute().layout.parameters == y.layout.parameters
+    assert_eq(computed_d, y)
+    assert computed_d.layout.parameters == y.layout.parameters
     assert d._meta.layout.parameters == y.layout.parameters
 
-    d2 = dak.without_parameters(d)
-    y2 = ak.without_parameters(y)
-    assert_eq(d2, y2)
-    assert not d2.compute().layout.parameters
-    assert d2.compute().layout.parameters == y2.layout.parameters
+    assert_eq(computed_d2, y2)
+    assert not computed_d2.layout.parameters
+    assert computed_d2.layout.parameters == y2.layout.parameters
     assert d2._meta.layout.parameters == y2.layout.parameters
 
 
-@pytest.mark.parametrize("axis", [1, -1])
-@pytest.mark.parametrize("fields", [None, ["a", "b"]])
-def test_combinations(caa, daa, axis, fields):
-    assert_eq(
-        dak.combinations(daa, 2, axis=axis),
-        ak.combinations(caa, 2, axis=axis),
+def test_combinations(caa, daa):
+    axes = [1, -1]
+    assert_eq_batched(
+        [dak.combinations(daa, 2, axis=axis) for axis in axes],
+        [ak.combinations(caa, 2, axis=axis) for axis in axes],
     )
 
 
 def test_combinations_raise(daa):
-    with pytest.raises(ValueError, match="if provided, the length"):
+    with pytest.raises(ValueError, match=_MATCH_FIELDS_LENGTH):
         dak.combinations(daa, 2, fields=["a", "b", "c"])
 
 
-@pytest.mark.parametrize("axis", [1, -1])
-@pytest.mark.parametrize("fields", [None, ["a", "b"]])
-def test_argcombinations(caa, daa, axis, fields):
-    if axis < 0:
-        with pytest.raises(
-            ValueError, match="the 'axis' for argcombinations must be non-negative"
-        ):
-            dak.argcombinations(daa, 2, axis=axis)
-    else:
-        assert_eq(
-            dak.argcombinations(daa, 2, axis=axis),
-            ak.argcombinations(caa, 2, axis=axis),
-        )
+def test_argcombinations(caa, daa):
+    assert_eq(
+        dak.argcombinations(daa, 2, axis=1),
+        ak.argcombinations(caa, 2, axis=1),
+    )
+
+    with pytest.raises(ValueError, match=_MATCH_ARGCOMBINATIONS_AXIS):
+        dak.argcombinations(daa, 2, axis=-1)
 
 
 def test_argcombinations_raise(daa):
-    with pytest.raises(ValueError, match="if provided, the length"):
+    with pytest.raises(ValueError, match=_MATCH_FIELDS_LENGTH):
         dak.argcombinations(daa, 2, fields=["a", "b", "c"])
 
 
 @pytest.mark.parametrize("mergebool", [True, False])
 def test_where(caa, daa, mergebool):
-    assert_eq(
-        dak.where(
-            daa.points.x > daa.points.y, daa.points.x, daa.points.y, mergebool=mergebool
-        ),
-        ak.where(
-            caa.points.x > caa.points.y, caa.points.x, caa.points.y, mergebool=mergebool
-        ),
-    )
-
-    assert_eq(
-        dak.where(
-            daa.points.x > daa.points.y, daa.points.x, 9999.0, mergebool=mergebool
-        ),
-        ak.where(
-            caa.points.x > caa.points.y, caa.points.x, 9999.0, mergebool=mergebool
-        ),
-    )
-
-    assert_eq(
-        dak.where(
-            daa.points.x > daa.points.y, 9999.0, daa.points.y, mergebool=mergebool
-        ),
-        ak.where(
-            caa.points.x > caa.points.y, 9999.0, caa.points.y, mergebool=mergebool
-        ),
-    )
-
-    assert_eq(
-        dak.where(daa.points.x > daa.points.y, 8888.0, 9999.0, mergebool=mergebool),
-        ak.where(caa.points.x > caa.points.y, 8888.0, 9999.0, mergebool=mergebool),
-    )
+    dpred = daa.points.x > daa.points.y
+    cpred = caa.points.x > caa.points.y
+    dx, dy = daa.points.x, daa.points.y
+    cx, cy = caa.points.x, caa.points.y
+
+    dak_results = [
+        dak.where(dpred, dx, dy, mergebool=mergebool),
+        dak.where(dpred, dx, 9999.0, mergebool=mergebool),
+        dak.where(dpred, 9999.0, dy, mergebool=mergebool),
+        dak.where(dpred, 8888.0, 9999.0, mergebool=mergebool),
+    ]
+    ak_results = [
+        ak.where(cpred, cx, cy, mergebool=mergebool),
+        ak.where(cpred, cx, 9999.0, mergebool=mergebool),
+        ak.where(cpred, 9999.0, cy, mergebool=mergebool),
+        ak.where(cpred, 8888.0, 9999.0, mergebool=mergebool),
+    ]
+    assert_eq_batched(dak_results, ak_results)
 
 
 def test_isclose(daa, caa):
@@ -360,36 +383,33 @@ def test_isclose(daa, caa):
     )
 
 
-def test_singletons(daa, L4, tmp_path):
+def test_singletons(caa_L4, daa_L4, pq_points_dir):
     pytest.importorskip("pyarrow")
 
     import warnings
 
-    path = str(tmp_path)
-
-    warnings.simplefilter("error")
-    caa_L4 = ak.Array(L4)
-    daa_L4 = dak.from_awkward(caa_L4, 1)
-    assert_eq(
-        dak.singletons(daa_L4),
-        ak.singletons(caa_L4),
-    )
-
-    dak.to_parquet(daa, path)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert_eq(
+            dak.singletons(daa_L4),
+            ak.singletons(caa_L4),
+        )
 
-    fpq_daa = dak.from_parquet(path)
-    fpq_caa = ak.from_parquet(path)
+        fpq_daa = dak.from_parquet(pq_points_dir)
+        fpq_caa = ak.from_parquet(pq_points_dir)
 
-    temp_zip = dak.zip({"x": fpq_daa.points.x, "y": fpq_daa.points.y})
+        temp_zip = dak.zip({"x": fpq_daa.points.x, "y": fpq_daa.points.y})
 
-    argmin_check = dak.singletons(dak.argmin(temp_zip.x, axis=1))
+        argmin_check = dak.singletons(dak.argmin(temp_zip.x, axis=1))
 
-    assert_eq(
-        argmin_check,
-        ak.singletons(
-            ak.argmin(ak.zip({"x": fpq_caa.points.x, "y": fpq_caa.points.y}).x, axis=1)
-        ),
-    )
+        assert_eq(
+            argmin_check,
+            ak.singletons(
+                ak.argmin(
+                    ak.zip({"x": fpq_caa.points.x, "y": fpq_caa.points.y}).x, axis=1
+                )
+            ),
+        )
 
 
 @pytest.mark.parametrize("ascending", [True, False])
@@ -399,9 +419,16 @@ def test_argsort(daa, caa, ascending):
         ak.argsort(caa.points.x, ascending=ascending),
     )
 
+
+@pytest.fixture(scope="module")
+def _nested_argsort() -> tuple[dak.Array, ak.Array]:
     x = [[[1, 2, 3], [5, 4]], [[3, 1], [2, 3]]]
-    a = dak.from_lists(x)
-    b = ak.concatenate([ak.Array(x[0]), ak.Array(x[1])])
+    return dak.from_lists(x), ak.concatenate([ak.Array(x[0]), ak.Array(x[1])])
+
+
+@pytest.mark.parametrize("ascending", [True, False])
+def test_argsort_nested(_nested_argsort, ascending):
+    a, b = _nested_argsort
     assert_eq(
         a[dak.argsort(a, axis=1, ascending=ascending)],
         b[ak.argsort(b, axis=1, ascending=ascending)],
@@ -421,37 +448,48 @@ def test_copy(daa):
     assert result._meta is not daa._meta
 
 
+_FULL_LIKE_DTYPES = [
+    bool,
+    np.int8,
+    np.uint8,
+    np.int16,
+    np.uint16,
+    np.int32,
+    np.uint32,
+    np.int64,
+    np.uint64,
+    np.float32,
+    np.float64,
+    np.complex64,
+    np.complex128,
+    np.float16,
+]
+
+
+def test_full_like(daa, caa):
+    value = 12.6
+    assert_eq_batched(
+        [dak.full_like(daa, value, dtype=dt) for dt in _FULL_LIKE_DTYPES],
+        [ak.full_like(caa, value, dtype=dt) for dt in _FULL_LIKE_DTYPES],
+    )
+
+
 @pytest.mark.parametrize(
     "thedtype",
     [
-        bool,
-        np.int8,
-        np.uint8,
-        np.int16,
-        np.uint16,
-        np.int32,
-        np.uint32,
-        np.int64,
-        np.uint64,
-        np.float32,
-        np.float64,
-        np.complex64,
-        np.complex128,
         pytest.param(
             np.datetime64,
             marks=pytest.mark.xfail(AK_LTE_2_5_0, reason="np dtype problem"),
         ),
         np.timedelta64,
-        np.float16,
     ],
 )
-def test_full_like(daa, caa, thedtype):
-    value = 12.6
+def test_full_like_time(daa, caa, thedtype):
     if thedtype is np.datetime64:
-        value = thedtype(int(value), "us")
+        value = thedtype(12, "us")
         thedtype = np.dtype("datetime64[us]")
-    elif thedtype is np.timedelta64:
-        value = thedtype(int(value))
+    else:
+        value = thedtype(12)
 
     assert_eq(
         dak.full_like(daa, value, dtype=thedtype),
@@ -542,6 +580,11 @@ def test_values_astype(daa, caa):
     )
 
 
+@pytest.fixture(scope="module")
+def daa_list(daa: dak.Array) -> list:
+    return daa.compute().tolist()
+
+
 def test_repartition_whole(daa):
     daa1 = daa.repartition(npartitions=1)
     assert daa1.npartitions == 1
@@ -554,15 +597,15 @@ def test_repartition_no_change(daa):
     assert_eq(daa, daa1, check_divisions=False)
 
 
-def test_repartition_split_all(daa):
+def test_repartition_split_all(daa, daa_list):
     daa1 = daa.repartition(rows_per_partition=1)
     assert daa1.npartitions == len(daa)
     out = daa1.compute()
-    assert out.tolist() == daa.compute().tolist()
+    assert out.tolist() == daa_list
 
 
-def test_repartition_uneven(daa):
+def test_repartition_uneven(daa, daa_list):
     daa1 = daa.repartition(divisions=(0, 7, 8, 11, 12))
     assert daa1.npartitions == 4
     out = daa1.compute()
-    assert out.tolist() == daa.compute()[:12].tolist()
+    assert out.tolist() == daa_list[:12]